@@ -16,6 +16,11 @@ COUNCIL_MODELS = [
     "x-ai/grok-4",
 ]
 
+# Wall-clock deadline (seconds) for each council model in Stage 1; slower
+# models are dropped from the round instead of holding up the whole council.
+# Stages 2 and 3 and title generation only use the per-request timeout.
+STAGE1_TIMEOUT = 120.0
+
 # Chairman model - synthesizes final response
 CHAIRMAN_MODEL = "google/gemini-3-pro-preview"
 
@@ -24,3 +29,10 @@ OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
+
+# Number of conversations kept in memory to avoid re-reading their JSON files
+CONVERSATION_CACHE_SIZE = 1024
+
+# Exact-match cache for deterministic helper queries (e.g. title generation)
+RESPONSE_CACHE_TTL = 3600  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = 1024
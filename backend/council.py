@@ -1,8 +1,76 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple
-from .openrouter import query_models_parallel, query_model
-from .config import COUNCIL_MODELS, CHAIRMAN_MODEL
+import re
+from typing import List, Dict, Any, Tuple, AsyncIterator, Callable, Optional
+from .openrouter import query_models_parallel, query_models_as_completed, query_model
+from .exact_cache import cached_query
+from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, STAGE1_TIMEOUT
+
+# Ranking parser patterns, compiled once at import
+_RANKING_HEADER = "FINAL RANKING:"
+_NUMBERED_RANKING_RE = re.compile(r'\d+\.\s*(Response [A-Z])')
+_RESPONSE_LABEL_RE = re.compile(r'Response [A-Z]')
+
+# Anonymized response labels ("Response A", "Response B", ...), one per council seat
+_RESPONSE_LABELS = [f"Response {chr(65 + i)}" for i in range(len(COUNCIL_MODELS))]
+
+# Static Stage 2 instructions; only the query and responses vary per call
+_RANKING_PROMPT_TEMPLATE = """You are evaluating different responses to the following question:
+
+Question: {user_query}
+
+Here are the responses from different models (anonymized):
+
+{responses_text}
+
+Your task:
+1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
+2. Then, at the very end of your response, provide a final ranking.
+
+IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
+- Start with the line "FINAL RANKING:" (all caps, with colon)
+- Then list the responses from best to worst as a numbered list
+- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
+- Do not add any other text or explanations in the ranking section
+
+Example of the correct format for your ENTIRE response:
+
+Response A provides good detail on X but misses Y...
+Response B is accurate but lacks depth on Z...
+Response C offers the most comprehensive answer...
+
+FINAL RANKING:
+1. Response C
+2. Response A
+3. Response B
+
+Now provide your evaluation and ranking:"""
+
+# Static Stage 3 instructions; only the query and council output vary per call
+_CHAIRMAN_PROMPT_TEMPLATE = """You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
+
+Original Question: {user_query}
+
+STAGE 1 - Individual Responses:
+{stage1_text}
+
+STAGE 2 - Peer Rankings:
+{stage2_text}
+
+Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
+- The individual responses and their insights
+- The peer rankings and what they reveal about response quality
+- Any patterns of agreement or disagreement
+
+Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
+
+# Static title-generation instructions; only the question varies per call
+_TITLE_PROMPT_TEMPLATE = """Generate a very short title (3-5 words maximum) that summarizes the following question.
+The title should be concise and descriptive. Do not use quotes or punctuation in the title.
+
+Question: {user_query}
+
+Title:"""
 
 
 async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
@@ -18,7 +86,7 @@ async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
     messages = [{"role": "user", "content": user_query}]
 
     # Query all models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    responses = await query_models_parallel(COUNCIL_MODELS, messages, deadline=STAGE1_TIMEOUT)
 
     # Format results
     stage1_results = []
@@ -32,6 +100,50 @@ async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
     return stage1_results
 
 
+async def stage1_collect_responses_iter(
+    user_query: str,
+    on_delta: Optional[Callable[[str, str], None]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stage 1, streaming variant: yield each council response as soon as it arrives.
+
+    Args:
+        user_query: The user's question
+        on_delta: Optional callback receiving (model, content fragment) while
+            responses are still being generated
+
+    Yields:
+        Dicts with 'model' and 'response' keys, in completion order
+    """
+    messages = [{"role": "user", "content": user_query}]
+
+    async for model, response in query_models_as_completed(
+        COUNCIL_MODELS, messages, on_delta=on_delta, deadline=STAGE1_TIMEOUT
+    ):
+        if response is not None:  # Only include successful responses
+            yield {
+                "model": model,
+                "response": response.get('content', '')
+            }
+
+
+def sort_stage1_results(stage1_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Put Stage 1 results back into council order.
+
+    Results collected in completion order would otherwise give each model a
+    different anonymized label from one run to the next.
+
+    Args:
+        stage1_results: Stage 1 results in any order
+
+    Returns:
+        The same results ordered as in COUNCIL_MODELS
+    """
+    council_order = {model: index for index, model in enumerate(COUNCIL_MODELS)}
+    return sorted(stage1_results, key=lambda result: council_order[result['model']])
+
+
 async def stage2_collect_rankings(
     user_query: str,
     stage1_results: List[Dict[str, Any]]
@@ -46,51 +158,25 @@ async def stage2_collect_rankings(
     Returns:
         Tuple of (rankings list, label_to_model mapping)
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
+    # Anonymized labels for responses (Response A, Response B, etc.)
+    labels = _RESPONSE_LABELS[:len(stage1_results)]
 
     # Create mapping from label to model name
     label_to_model = {
-        f"Response {label}": result['model']
+        label: result['model']
         for label, result in zip(labels, stage1_results)
     }
 
     # Build the ranking prompt
     responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
+        f"{label}:\n{result['response']}"
         for label, result in zip(labels, stage1_results)
     ])
 
-    ranking_prompt = f"""You are evaluating different responses to the following question:
-
-Question: {user_query}
-
-Here are the responses from different models (anonymized):
-
-{responses_text}
-
-Your task:
-1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
-2. Then, at the very end of your response, provide a final ranking.
-
-IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
-- Start with the line "FINAL RANKING:" (all caps, with colon)
-- Then list the responses from best to worst as a numbered list
-- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
-- Do not add any other text or explanations in the ranking section
-
-Example of the correct format for your ENTIRE response:
-
-Response A provides good detail on X but misses Y...
-Response B is accurate but lacks depth on Z...
-Response C offers the most comprehensive answer...
-
-FINAL RANKING:
-1. Response C
-2. Response A
-3. Response B
-
-Now provide your evaluation and ranking:"""
+    ranking_prompt = _RANKING_PROMPT_TEMPLATE.format(
+        user_query=user_query,
+        responses_text=responses_text
+    )
 
     messages = [{"role": "user", "content": ranking_prompt}]
 
@@ -139,22 +225,11 @@ async def stage3_synthesize_final(
         for result in stage2_results
     ])
 
-    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
-
-Original Question: {user_query}
-
-STAGE 1 - Individual Responses:
-{stage1_text}
-
-STAGE 2 - Peer Rankings:
-{stage2_text}
-
-Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
-- The individual responses and their insights
-- The peer rankings and what they reveal about response quality
-- Any patterns of agreement or disagreement
-
-Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
+    chairman_prompt = _CHAIRMAN_PROMPT_TEMPLATE.format(
+        user_query=user_query,
+        stage1_text=stage1_text,
+        stage2_text=stage2_text
+    )
 
     messages = [{"role": "user", "content": chairman_prompt}]
 
@@ -184,28 +259,22 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
     Returns:
         List of response labels in ranked order
     """
-    import re
-
     # Look for "FINAL RANKING:" section
-    if "FINAL RANKING:" in ranking_text:
-        # Extract everything after "FINAL RANKING:"
-        parts = ranking_text.split("FINAL RANKING:")
-        if len(parts) >= 2:
-            ranking_section = parts[1]
-            # Try to extract numbered list format (e.g., "1. Response A")
-            # This pattern looks for: number, period, optional space, "Response X"
-            numbered_matches = re.findall(r'\d+\.\s*Response [A-Z]', ranking_section)
-            if numbered_matches:
-                # Extract just the "Response X" part
-                return [re.search(r'Response [A-Z]', m).group() for m in numbered_matches]
-
-            # Fallback: Extract all "Response X" patterns in order
-            matches = re.findall(r'Response [A-Z]', ranking_section)
-            return matches
+    _, found, after_header = ranking_text.partition(_RANKING_HEADER)
+    if found:
+        # Extract everything after "FINAL RANKING:" (up to any repeated header)
+        ranking_section = after_header.split(_RANKING_HEADER, 1)[0]
+        # Try to extract numbered list format (e.g., "1. Response A"),
+        # capturing just the "Response X" part in the same pass
+        numbered_matches = _NUMBERED_RANKING_RE.findall(ranking_section)
+        if numbered_matches:
+            return numbered_matches
+
+        # Fallback: Extract all "Response X" patterns in order
+        return _RESPONSE_LABEL_RE.findall(ranking_section)
 
     # Fallback: try to find any "Response X" patterns in order
-    matches = re.findall(r'Response [A-Z]', ranking_text)
-    return matches
+    return _RESPONSE_LABEL_RE.findall(ranking_text)
 
 
 def calculate_aggregate_rankings(
@@ -222,32 +291,31 @@ def calculate_aggregate_rankings(
     Returns:
         List of dicts with model name and average rank, sorted best to worst
     """
-    from collections import defaultdict
-
-    # Track positions for each model
-    model_positions = defaultdict(list)
+    # Running totals per model: sum of positions and number of votes
+    position_totals: Dict[str, int] = {}
+    position_counts: Dict[str, int] = {}
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
+        # Reuse the ranking parsed in Stage 2; only parse if it is missing
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
 
         for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
+            model_name = label_to_model.get(label)
+            if model_name is not None:
+                position_totals[model_name] = position_totals.get(model_name, 0) + position
+                position_counts[model_name] = position_counts.get(model_name, 0) + 1
 
     # Calculate average position for each model
-    aggregate = []
-    for model, positions in model_positions.items():
-        if positions:
-            avg_rank = sum(positions) / len(positions)
-            aggregate.append({
-                "model": model,
-                "average_rank": round(avg_rank, 2),
-                "rankings_count": len(positions)
-            })
+    aggregate = [
+        {
+            "model": model,
+            "average_rank": round(total / position_counts[model], 2),
+            "rankings_count": position_counts[model]
+        }
+        for model, total in position_totals.items()
+    ]
 
     # Sort by average rank (lower is better)
     aggregate.sort(key=lambda x: x['average_rank'])
@@ -265,17 +333,13 @@ async def generate_conversation_title(user_query: str) -> str:
     Returns:
         A short title (3-5 words)
     """
-    title_prompt = f"""Generate a very short title (3-5 words maximum) that summarizes the following question.
-The title should be concise and descriptive. Do not use quotes or punctuation in the title.
-
-Question: {user_query}
-
-Title:"""
+    title_prompt = _TITLE_PROMPT_TEMPLATE.format(user_query=user_query)
 
     messages = [{"role": "user", "content": title_prompt}]
 
-    # Use gemini-2.5-flash for title generation (fast and cheap)
-    response = await query_model("google/gemini-2.5-flash", messages, timeout=30.0)
+    # Use gemini-2.5-flash for title generation (fast and cheap); the same
+    # question always gets the same title, so repeats are served from cache
+    response = await cached_query("google/gemini-2.5-flash", messages, timeout=30.0)
 
     if response is None:
         # Fallback to a generic title
@@ -0,0 +1,73 @@
+"""In-memory exact-match cache for deterministic model queries."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from .openrouter import query_model
+from .config import RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES
+
+# cache key -> (expiry timestamp, response dict), least recently used first
+_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+stats = {"hits": 0, "misses": 0}
+
+
+def cache_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Build a stable key for a model query.
+
+    Args:
+        model: OpenRouter model identifier
+        messages: List of message dicts with 'role' and 'content'
+
+    Returns:
+        SHA-256 hex digest of the model and canonicalized messages
+    """
+    canonical = json.dumps([model, messages], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def cached_query(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0
+) -> Optional[Dict[str, Any]]:
+    """
+    Query a model, reusing the response to an identical earlier query.
+
+    Only use this for prompts where any valid answer is as good as a fresh
+    one. Failed queries (None) are not cached, so they are retried next time.
+    Every caller gets its own copy of the response dict.
+
+    Args:
+        model: OpenRouter model identifier
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Request timeout in seconds
+
+    Returns:
+        Response dict with 'content' and optional 'reasoning_details', or None if failed
+    """
+    key = cache_key(model, messages)
+    now = time.monotonic()
+
+    entry = _cache.get(key)
+    if entry is not None:
+        expires_at, response = entry
+        if expires_at > now:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            return dict(response)
+        del _cache[key]
+
+    stats["misses"] += 1
+    response = await query_model(model, messages, timeout=timeout)
+
+    if response is not None:
+        _cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, dict(response))
+        _cache.move_to_end(key)
+        while len(_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+    return response
@@ -1,18 +1,31 @@
 """FastAPI backend for LLM Council."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
+from contextlib import asynccontextmanager
 import uuid
 import json
 import asyncio
+import os
+import threading
 
 from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
+from .openrouter import close_client
+from .config import COUNCIL_MODELS
+from .council import run_full_council, generate_conversation_title, stage1_collect_responses_iter, sort_stage1_results, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
 
-app = FastAPI(title="LLM Council API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release pooled OpenRouter connections when the server shuts down."""
+    yield
+    await close_client()
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -24,6 +37,38 @@ allow_origins=["http://localhost:5173", "http://localhost:3000", "https://llm-co
 )
 
 
+# Random bytes for conversation IDs are drawn from the OS in batches
+# rather than with one os.urandom() call per UUID
+_UUID_BATCH_SIZE = 256
+_uuid_bytes = b""
+_uuid_offset = 0
+_uuid_lock = threading.Lock()
+
+
+def new_conversation_id() -> str:
+    """Return a new random (version 4) UUID string for a conversation."""
+    global _uuid_bytes, _uuid_offset
+    with _uuid_lock:
+        if _uuid_offset >= len(_uuid_bytes):
+            _uuid_bytes = os.urandom(16 * _UUID_BATCH_SIZE)
+            _uuid_offset = 0
+        raw = _uuid_bytes[_uuid_offset:_uuid_offset + 16]
+        _uuid_offset += 16
+    return str(uuid.UUID(bytes=raw, version=4))
+
+
+def sse_event(event: Dict[str, Any]) -> bytes:
+    """Frame an event as a Server-Sent Events message, ready to send as bytes."""
+    return b"data: " + json.dumps(event).encode() + b"\n\n"
+
+
+# These SSE events never change, so serialize them once at import
+SSE_STAGE1_START = sse_event({'type': 'stage1_start', 'models': COUNCIL_MODELS})
+SSE_STAGE2_START = sse_event({'type': 'stage2_start'})
+SSE_STAGE3_START = sse_event({'type': 'stage3_start'})
+SSE_COMPLETE = sse_event({'type': 'complete'})
+
+
 class CreateConversationRequest(BaseModel):
     """Request to create a new conversation."""
     pass
@@ -50,6 +95,34 @@ class Conversation(BaseModel):
     messages: List[Dict[str, Any]]
 
 
+async def require_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Load a conversation once per request, or raise 404 if it doesn't exist.
+
+    Endpoints pass the returned dict on to storage so it is not re-read
+    from disk for every update. Cached conversations are returned directly;
+    only a cache miss reads the file, in a worker thread so it never blocks
+    the event loop serving other streams.
+    """
+    conversation = storage.get_cached_conversation(conversation_id)
+    if conversation is None:
+        conversation = await asyncio.to_thread(storage.get_conversation, conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation
+
+
+async def save_title(
+    conversation_id: str,
+    title_task: "asyncio.Task[str]",
+    conversation: Dict[str, Any]
+) -> str:
+    """Wait for a title generated in the background and store it."""
+    title = await title_task
+    await asyncio.to_thread(storage.update_conversation_title, conversation_id, title, conversation)
+    return title
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -59,59 +132,63 @@ async def root():
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
 async def list_conversations():
     """List all conversations (metadata only)."""
-    return storage.list_conversations()
+    return await asyncio.to_thread(storage.list_conversations)
 
 
 @app.post("/api/conversations", response_model=Conversation)
 async def create_conversation(request: CreateConversationRequest):
     """Create a new conversation."""
-    conversation_id = str(uuid.uuid4())
-    conversation = storage.create_conversation(conversation_id)
+    conversation_id = new_conversation_id()
+    conversation = await asyncio.to_thread(storage.create_conversation, conversation_id)
     return conversation
 
 
 @app.get("/api/conversations/{conversation_id}", response_model=Conversation)
-async def get_conversation(conversation_id: str):
+async def get_conversation(conversation: Dict[str, Any] = Depends(require_conversation)):
     """Get a specific conversation with all its messages."""
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
-        raise HTTPException(status_code=404, detail="Conversation not found")
     return conversation
 
 
 @app.post("/api/conversations/{conversation_id}/message")
-async def send_message(conversation_id: str, request: SendMessageRequest):
+async def send_message(
+    conversation_id: str,
+    request: SendMessageRequest,
+    conversation: Dict[str, Any] = Depends(require_conversation)
+):
     """
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
     """
-    # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
     # Add user message
-    storage.add_user_message(conversation_id, request.content)
+    await asyncio.to_thread(storage.add_user_message, conversation_id, request.content, conversation)
 
-    # If this is the first message, generate a title
+    # Start title generation in parallel with the council (don't await yet)
+    title_task = None
     if is_first_message:
-        title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
-
-    # Run the 3-stage council process
-    stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
-        request.content
-    )
+        title_task = asyncio.create_task(generate_conversation_title(request.content))
+
+    try:
+        # Run the 3-stage council process
+        stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
+            request.content
+        )
+    finally:
+        # Wait for title generation if it was started; the title is kept
+        # even when the council fails
+        if title_task:
+            await save_title(conversation_id, title_task, conversation)
 
     # Add assistant message with all stages
-    storage.add_assistant_message(
+    await asyncio.to_thread(
+        storage.add_assistant_message,
         conversation_id,
         stage1_results,
         stage2_results,
-        stage3_result
+        stage3_result,
+        conversation
     )
 
     # Return the complete response with metadata
@@ -123,66 +200,111 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     }
 
 
+async def stream_stage1(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Run Stage 1, yielding SSE frames as tokens and finished responses arrive.
+
+    Emits 'stage1_delta' frames with each model's content fragments and a
+    'stage1_partial' frame when a model finishes. Finished responses are
+    appended to `stage1_results` in completion order.
+    """
+    frames: asyncio.Queue = asyncio.Queue()
+
+    def on_delta(model: str, delta: str):
+        frames.put_nowait(sse_event({'type': 'stage1_delta', 'model': model, 'delta': delta}))
+
+    async def collect():
+        try:
+            async for result in stage1_collect_responses_iter(user_query, on_delta):
+                stage1_results.append(result)
+                frames.put_nowait(sse_event({'type': 'stage1_partial', 'data': result}))
+        finally:
+            frames.put_nowait(None)
+
+    collector = asyncio.create_task(collect())
+    try:
+        while (frame := await frames.get()) is not None:
+            yield frame
+        # Surface any error raised while collecting Stage 1
+        await collector
+    finally:
+        # If the client went away, cancelling the collector also cancels every
+        # outstanding model query (see query_models_as_completed)
+        collector.cancel()
+
+
 @app.post("/api/conversations/{conversation_id}/message/stream")
-async def send_message_stream(conversation_id: str, request: SendMessageRequest):
+async def send_message_stream(
+    conversation_id: str,
+    request: SendMessageRequest,
+    conversation: Dict[str, Any] = Depends(require_conversation)
+):
     """
     Send a message and stream the 3-stage council process.
     Returns Server-Sent Events as each stage completes.
     """
-    # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
-    if conversation is None:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
     async def event_generator():
+        title_task = None
         try:
             # Add user message
-            storage.add_user_message(conversation_id, request.content)
+            await asyncio.to_thread(storage.add_user_message, conversation_id, request.content, conversation)
 
             # Start title generation in parallel (don't await yet)
-            title_task = None
             if is_first_message:
                 title_task = asyncio.create_task(generate_conversation_title(request.content))
 
             # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(request.content)
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
+            yield SSE_STAGE1_START
+            stage1_results = []
+            async for frame in stream_stage1(request.content, stage1_results):
+                yield frame
+            stage1_results = sort_stage1_results(stage1_results)
+            yield sse_event({'type': 'stage1_complete', 'data': stage1_results})
 
             # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
+            yield SSE_STAGE2_START
             stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results)
             aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
+            yield sse_event({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})
 
             # Stage 3: Synthesize final answer
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
+            yield SSE_STAGE3_START
             stage3_result = await stage3_synthesize_final(request.content, stage1_results, stage2_results)
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
+            yield sse_event({'type': 'stage3_complete', 'data': stage3_result})
 
             # Wait for title generation if it was started
             if title_task:
-                title = await title_task
-                storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
+                pending_title, title_task = title_task, None
+                title = await save_title(conversation_id, pending_title, conversation)
+                yield sse_event({'type': 'title_complete', 'data': {'title': title}})
 
             # Save complete assistant message
-            storage.add_assistant_message(
+            await asyncio.to_thread(
+                storage.add_assistant_message,
                 conversation_id,
                 stage1_results,
                 stage2_results,
-                stage3_result
+                stage3_result,
+                conversation
             )
 
             # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            yield SSE_COMPLETE
 
         except Exception as e:
             # Send error event
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield sse_event({'type': 'error', 'message': str(e)})
+
+        finally:
+            # A failed or abandoned stream still keeps the conversation's title
+            if title_task:
+                await save_title(conversation_id, title_task, conversation)
 
     return StreamingResponse(
         event_generator(),
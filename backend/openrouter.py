@@ -1,14 +1,115 @@
 """OpenRouter API client for making LLM requests."""
 
+import asyncio
+import json
 import httpx
-from typing import List, Dict, Any, Optional
+from functools import partial
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Callable
 from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
 
+# Shared client so every council query reuses pooled keep-alive connections
+# instead of paying a fresh TCP + TLS handshake per request
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared OpenRouter HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=120.0
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared OpenRouter HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _post_completion(
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: float
+) -> Dict[str, Any]:
+    """Send a completion request and return the message from the full JSON body."""
+    response = await get_client().post(
+        OPENROUTER_API_URL,
+        headers=headers,
+        json=payload,
+        timeout=timeout
+    )
+    response.raise_for_status()
+
+    data = response.json()
+    message = data['choices'][0]['message']
+
+    return {
+        'content': message.get('content'),
+        'reasoning_details': message.get('reasoning_details')
+    }
+
+
+async def _stream_completion(
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: float,
+    on_delta: Callable[[str], None]
+) -> Dict[str, Any]:
+    """
+    Send a streaming completion request, reporting content deltas as they arrive.
+
+    Returns the same dict shape as a non-streaming request once the stream ends.
+    """
+    content_parts = []
+    reasoning_details = []
+
+    async with get_client().stream(
+        "POST",
+        OPENROUTER_API_URL,
+        headers=headers,
+        json={**payload, "stream": True},
+        timeout=timeout
+    ) as response:
+        response.raise_for_status()
+
+        async for line in response.aiter_lines():
+            # Skip blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+            if not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+
+            chunk = json.loads(data)
+            if 'error' in chunk:
+                raise RuntimeError(chunk['error'].get('message', chunk['error']))
+            if not chunk.get('choices'):
+                continue
+
+            delta = chunk['choices'][0].get('delta') or {}
+            if delta.get('content'):
+                content_parts.append(delta['content'])
+                on_delta(delta['content'])
+            if delta.get('reasoning_details'):
+                reasoning_details.extend(delta['reasoning_details'])
+
+    return {
+        'content': "".join(content_parts),
+        'reasoning_details': reasoning_details or None
+    }
+
 
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    on_delta: Optional[Callable[[str], None]] = None,
+    deadline: Optional[float] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via OpenRouter API.
@@ -17,6 +118,10 @@ async def query_model(
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        on_delta: If given, stream the completion and call this with each
+            content fragment as it arrives
+        deadline: Optional wall-clock limit in seconds for the whole call;
+            a model still answering when it passes counts as failed
 
     Returns:
         Response dict with 'content' and optional 'reasoning_details', or None if failed
@@ -31,22 +136,22 @@ async def query_model(
         "messages": messages,
     }
 
+    if on_delta is None:
+        request = _post_completion(headers, payload, timeout)
+    else:
+        request = _stream_completion(headers, payload, timeout, on_delta)
+
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            message = data['choices'][0]['message']
-
-            return {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details')
-            }
+        if deadline is None:
+            return await request
+        # httpx timeouts apply per network operation, so a slow response
+        # that keeps trickling bytes could run far past `timeout`;
+        # wait_for caps the whole call instead
+        return await asyncio.wait_for(request, deadline)
+
+    except asyncio.TimeoutError:
+        print(f"Error querying model {model}: no answer within {deadline}s")
+        return None
 
     except Exception as e:
         print(f"Error querying model {model}: {e}")
@@ -55,7 +160,9 @@ async def query_model(
 
 async def query_models_parallel(
     models: List[str],
-    messages: List[Dict[str, str]]
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    deadline: Optional[float] = None
 ) -> Dict[str, Optional[Dict[str, Any]]]:
     """
     Query multiple models in parallel.
@@ -63,17 +170,59 @@ async def query_models_parallel(
     Args:
         models: List of OpenRouter model identifiers
         messages: List of message dicts to send to each model
+        timeout: Request timeout in seconds
+        deadline: Optional per-model wall-clock limit in seconds; slower
+            models count as failed
 
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-
     # Create tasks for all models
-    tasks = [query_model(model, messages) for model in models]
+    tasks = [query_model(model, messages, timeout, deadline=deadline) for model in models]
 
     # Wait for all to complete
     responses = await asyncio.gather(*tasks)
 
     # Map models to their responses
     return {model: response for model, response in zip(models, responses)}
+
+
+async def query_models_as_completed(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    on_delta: Optional[Callable[[str, str], None]] = None,
+    deadline: Optional[float] = None
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Query multiple models in parallel, yielding each result as soon as it arrives.
+
+    Args:
+        models: List of OpenRouter model identifiers
+        messages: List of message dicts to send to each model
+        timeout: Request timeout in seconds
+        on_delta: If given, stream every completion and call this with
+            (model, content fragment) as fragments arrive
+        deadline: Optional per-model wall-clock limit in seconds; slower
+            models count as failed
+
+    Yields:
+        Tuples of (model identifier, response dict or None if failed),
+        in completion order rather than the order of `models`
+    """
+    async def query_with_model(model: str):
+        model_on_delta = partial(on_delta, model) if on_delta else None
+        return model, await query_model(
+            model, messages, timeout, model_on_delta, deadline=deadline
+        )
+
+    tasks = [asyncio.create_task(query_with_model(model)) for model in models]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # If the consumer stops early (client disconnect, cancellation),
+        # don't leave the remaining model queries running in the background
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -2,10 +2,23 @@
 
 import json
 import os
+import threading
+import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
-from .config import DATA_DIR
+from .config import DATA_DIR, CONVERSATION_CACHE_SIZE
+
+# Recently used conversations, least recently used first. Every save writes
+# through, so entries always match what is on disk. Callers only ever get
+# copies (see _copy_conversation), so entries are never changed outside the lock.
+_conversation_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Serializes read-modify-write updates so concurrent requests on the same
+# conversation can't overwrite each other's messages
+_update_lock = threading.Lock()
 
 
 def ensure_data_dir():
@@ -18,6 +31,47 @@ def get_conversation_path(conversation_id: str) -> str:
     return os.path.join(DATA_DIR, f"{conversation_id}.json")
 
 
+def _copy_conversation(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a conversation so it can be changed without touching the original.
+
+    Stored messages are never modified in place, only appended, so copying
+    the top-level dict and the messages list is enough.
+    """
+    return {**conversation, "messages": list(conversation["messages"])}
+
+
+def _cache_put(conversation: Dict[str, Any]):
+    """Store a copy of a conversation in the in-memory cache, evicting the oldest if full."""
+    conversation = _copy_conversation(conversation)
+    with _cache_lock:
+        _conversation_cache[conversation['id']] = conversation
+        _conversation_cache.move_to_end(conversation['id'])
+        while len(_conversation_cache) > CONVERSATION_CACHE_SIZE:
+            _conversation_cache.popitem(last=False)
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]):
+    """
+    Write compact JSON to a file without ever exposing a partial write.
+
+    The data goes to a uniquely named sibling file (created with the usual
+    umask-derived mode), is flushed to disk, then renamed over `path` in a
+    single atomic step.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    f = open(tmp_path, 'x')
+    try:
+        with f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def create_conversation(conversation_id: str) -> Dict[str, Any]:
     """
     Create a new conversation.
@@ -38,13 +92,30 @@ def create_conversation(conversation_id: str) -> Dict[str, Any]:
     }
 
     # Save to file
-    path = get_conversation_path(conversation_id)
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    _write_json_atomic(get_conversation_path(conversation_id), conversation)
+    _cache_put(conversation)
 
     return conversation
 
 
+def get_cached_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a conversation from the in-memory cache without touching the disk.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Copy of the cached conversation dict, or None if it is not cached
+    """
+    with _cache_lock:
+        conversation = _conversation_cache.get(conversation_id)
+        if conversation is None:
+            return None
+        _conversation_cache.move_to_end(conversation_id)
+    return _copy_conversation(conversation)
+
+
 def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     """
     Load a conversation from storage.
@@ -55,13 +126,20 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Conversation dict or None if not found
     """
+    conversation = get_cached_conversation(conversation_id)
+    if conversation is not None:
+        return conversation
+
     path = get_conversation_path(conversation_id)
 
     if not os.path.exists(path):
         return None
 
     with open(path, 'r') as f:
-        return json.load(f)
+        conversation = json.load(f)
+
+    _cache_put(conversation)
+    return conversation
 
 
 def save_conversation(conversation: Dict[str, Any]):
@@ -73,9 +151,43 @@ def save_conversation(conversation: Dict[str, Any]):
     """
     ensure_data_dir()
 
-    path = get_conversation_path(conversation['id'])
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    try:
+        _write_json_atomic(get_conversation_path(conversation['id']), conversation)
+    except BaseException:
+        # Don't trust the cached copy once a write has failed; reload from disk next time
+        with _cache_lock:
+            _conversation_cache.pop(conversation['id'], None)
+        raise
+
+    _cache_put(conversation)
+
+
+def _update_conversation(
+    conversation_id: str,
+    conversation: Optional[Dict[str, Any]],
+    update: Callable[[Dict[str, Any]], None]
+):
+    """
+    Apply `update` to the latest saved state of a conversation and save it.
+
+    The latest state comes from the cache, then from the caller's
+    already-loaded copy, and only then from disk. The caller's copy gets
+    the same update once it has been saved.
+    """
+    with _update_lock:
+        latest = get_cached_conversation(conversation_id)
+        if latest is None and conversation is not None:
+            latest = _copy_conversation(conversation)
+        if latest is None:
+            latest = get_conversation(conversation_id)
+        if latest is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        update(latest)
+        save_conversation(latest)
+
+    if conversation is not None:
+        update(conversation)
 
 
 def list_conversations() -> List[Dict[str, Any]]:
@@ -107,31 +219,35 @@ def list_conversations() -> List[Dict[str, Any]]:
     return conversations
 
 
-def add_user_message(conversation_id: str, content: str):
+def add_user_message(
+    conversation_id: str,
+    content: str,
+    conversation: Optional[Dict[str, Any]] = None
+):
     """
     Add a user message to a conversation.
 
     Args:
         conversation_id: Conversation identifier
         content: User message content
+        conversation: Already-loaded conversation dict, kept in step with the saved one
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
-
-    conversation["messages"].append({
+    message = {
         "role": "user",
         "content": content
-    })
+    }
 
-    save_conversation(conversation)
+    _update_conversation(
+        conversation_id, conversation, lambda conv: conv["messages"].append(message)
+    )
 
 
 def add_assistant_message(
     conversation_id: str,
     stage1: List[Dict[str, Any]],
     stage2: List[Dict[str, Any]],
-    stage3: Dict[str, Any]
+    stage3: Dict[str, Any],
+    conversation: Optional[Dict[str, Any]] = None
 ):
     """
     Add an assistant message with all 3 stages to a conversation.
@@ -141,32 +257,34 @@ def add_assistant_message(
         stage1: List of individual model responses
         stage2: List of model rankings
         stage3: Final synthesized response
+        conversation: Already-loaded conversation dict, kept in step with the saved one
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
-
-    conversation["messages"].append({
+    message = {
         "role": "assistant",
         "stage1": stage1,
         "stage2": stage2,
         "stage3": stage3
-    })
+    }
 
-    save_conversation(conversation)
+    _update_conversation(
+        conversation_id, conversation, lambda conv: conv["messages"].append(message)
+    )
 
 
-def update_conversation_title(conversation_id: str, title: str):
+def update_conversation_title(
+    conversation_id: str,
+    title: str,
+    conversation: Optional[Dict[str, Any]] = None
+):
     """
     Update the title of a conversation.
 
     Args:
         conversation_id: Conversation identifier
         title: New title for the conversation
+        conversation: Already-loaded conversation dict, kept in step with the saved one
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
+    def set_title(conv: Dict[str, Any]):
+        conv["title"] = title
 
-    conversation["title"] = title
-    save_conversation(conversation)
+    _update_conversation(conversation_id, conversation, set_title)
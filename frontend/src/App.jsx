@@ -4,6 +4,18 @@ import ChatInterface from './components/ChatInterface';
 import { api } from './api';
 import './App.css';
 
+// Insert or replace a model's Stage 1 response, keeping tabs in council order
+// so they don't jump when the final (council-ordered) list arrives
+function upsertStage1Response(responses, response, councilOrder) {
+  const position = (resp) => {
+    const index = councilOrder.indexOf(resp.model);
+    return index === -1 ? councilOrder.length : index;
+  };
+  const updated = (responses || []).filter((resp) => resp.model !== response.model);
+  updated.push(response);
+  return updated.sort((a, b) => position(a) - position(b));
+}
+
 function App() {
   const [conversations, setConversations] = useState([]);
   const [currentConversationId, setCurrentConversationId] = useState(null);
@@ -89,10 +101,16 @@ function App() {
         messages: [...prev.messages, assistantMessage],
       }));
 
+      // Stage 1 text streamed so far, keyed by model
+      const drafts = {};
+      // Council model order, announced with stage1_start
+      let councilOrder = [];
+
       // Send message with streaming
       await api.sendMessageStream(currentConversationId, content, (eventType, event) => {
         switch (eventType) {
           case 'stage1_start':
+            councilOrder = event.models || [];
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
               const lastMsg = messages[messages.length - 1];
@@ -101,6 +119,28 @@ function App() {
             });
             break;
 
+          case 'stage1_delta': {
+            // Accumulate outside the updater so a repeated updater call stays idempotent
+            drafts[event.model] = (drafts[event.model] || '') + event.delta;
+            const draft = { model: event.model, response: drafts[event.model] };
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage1 = upsertStage1Response(lastMsg.stage1, draft, councilOrder);
+              return { ...prev, messages };
+            });
+            break;
+          }
+
+          case 'stage1_partial':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage1 = upsertStage1Response(lastMsg.stage1, event.data, councilOrder);
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage1_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
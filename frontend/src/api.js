@@ -91,13 +91,16 @@ export const api = {
 
     const reader = response.body.getReader();
     const decoder = new TextDecoder();
+    // Events can be split across network chunks, so only parse complete lines
+    let buffer = '';
 
     while (true) {
       const { done, value } = await reader.read();
       if (done) break;
 
-      const chunk = decoder.decode(value);
-      const lines = chunk.split('\n');
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
 
       for (const line of lines) {
         if (line.startsWith('data: ')) {
@@ -0,0 +1,85 @@
+"""Tests for the exact-match response cache."""
+
+import unittest
+from unittest import mock
+
+from backend import exact_cache
+
+
+class CachedQueryTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.responses = {}
+        self.calls = []
+        self.now = 1000.0
+
+        async def fake_query(model, messages, timeout=120.0):
+            self.calls.append(messages[0]["content"])
+            return self.responses.get(messages[0]["content"])
+
+        for patcher in (
+            mock.patch.object(exact_cache, "query_model", fake_query),
+            mock.patch.object(exact_cache.time, "monotonic", lambda: self.now),
+            mock.patch.object(exact_cache, "RESPONSE_CACHE_TTL", 60),
+            mock.patch.object(exact_cache, "RESPONSE_CACHE_MAX_ENTRIES", 2),
+            mock.patch.dict(exact_cache.stats, {"hits": 0, "misses": 0}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        exact_cache._cache.clear()
+        self.addCleanup(exact_cache._cache.clear)
+
+    async def query(self, prompt):
+        self.responses.setdefault(prompt, {"content": prompt.upper(), "reasoning_details": None})
+        return await exact_cache.cached_query("model", [{"role": "user", "content": prompt}])
+
+    async def test_repeated_query_is_a_hit(self):
+        first = await self.query("q")
+        second = await self.query("q")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, ["q"])
+        self.assertEqual(exact_cache.stats, {"hits": 1, "misses": 1})
+
+    async def test_entries_expire_after_ttl(self):
+        await self.query("q")
+        self.now += 61
+        await self.query("q")
+
+        self.assertEqual(self.calls, ["q", "q"])
+        self.assertEqual(exact_cache.stats, {"hits": 0, "misses": 2})
+
+    async def test_evicts_least_recently_used(self):
+        await self.query("a")
+        await self.query("b")
+        await self.query("a")
+        await self.query("c")
+        await self.query("b")
+
+        self.assertEqual(self.calls, ["a", "b", "c", "b"])
+
+    async def test_failed_query_is_not_cached(self):
+        self.responses["q"] = None
+        self.assertIsNone(await exact_cache.cached_query("model", [{"role": "user", "content": "q"}]))
+
+        self.responses["q"] = {"content": "Q", "reasoning_details": None}
+        self.assertEqual((await self.query("q"))["content"], "Q")
+        self.assertEqual(self.calls, ["q", "q"])
+
+    async def test_callers_get_copies(self):
+        first = await self.query("q")
+        first["content"] = "changed by first caller"
+        second = await self.query("q")
+        second["content"] = "changed by second caller"
+
+        self.assertEqual((await self.query("q"))["content"], "Q")
+
+    def test_key_ignores_dict_order_but_not_content(self):
+        key = exact_cache.cache_key("model", [{"role": "user", "content": "q"}])
+
+        self.assertEqual(key, exact_cache.cache_key("model", [{"content": "q", "role": "user"}]))
+        self.assertNotEqual(key, exact_cache.cache_key("other", [{"role": "user", "content": "q"}]))
+        self.assertNotEqual(key, exact_cache.cache_key("model", [{"role": "user", "content": "r"}]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Tests for the streaming council endpoint helpers."""
+
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import main, openrouter, storage
+from backend.config import COUNCIL_MODELS
+
+
+class StreamStage1Test(unittest.IsolatedAsyncioTestCase):
+    async def test_closing_stream_stops_model_queries(self):
+        fast_model = COUNCIL_MODELS[0]
+        running = set()
+
+        async def streaming_query(model, messages, timeout=120.0, on_delta=None, deadline=None):
+            running.add(model)
+            try:
+                on_delta("partial text")
+                await asyncio.sleep(0 if model == fast_model else 10)
+                return {"content": "done"}
+            finally:
+                running.discard(model)
+
+        with mock.patch.object(openrouter, "query_model", streaming_query):
+            stage1_results = []
+            frames = main.stream_stage1("question", stage1_results)
+            first_frame = await frames.__anext__()
+            self.assertIn(b'"stage1_delta"', first_frame)
+
+            await frames.aclose()
+            # Let the cancelled collector and query tasks unwind
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+        self.assertEqual(running, set())
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        self.assertEqual(pending, [])
+
+
+class RequireConversationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cache_hit_stays_on_event_loop(self):
+        cached = {"id": "a", "created_at": "", "title": "t", "messages": []}
+        with mock.patch.object(main.storage, "get_cached_conversation", return_value=cached), \
+                mock.patch.object(main.asyncio, "to_thread") as to_thread:
+            conversation = await main.require_conversation("a")
+
+        self.assertIs(conversation, cached)
+        to_thread.assert_not_called()
+
+    async def test_cache_miss_reads_in_worker_thread(self):
+        with mock.patch.object(main.storage, "get_cached_conversation", return_value=None), \
+                mock.patch.object(main.storage, "get_conversation", return_value=None) as get_conversation:
+            with self.assertRaises(main.HTTPException) as raised:
+                await main.require_conversation("missing")
+
+        self.assertEqual(raised.exception.status_code, 404)
+        get_conversation.assert_called_once_with("missing")
+
+
+class TitleOnCouncilFailureTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+
+        async def fake_title(user_query):
+            return "Saved Title"
+
+        async def failing_council(*args, **kwargs):
+            raise RuntimeError("council failed")
+
+        for patcher in (
+            mock.patch.object(storage, "DATA_DIR", tmp_dir.name),
+            mock.patch.object(main, "generate_conversation_title", fake_title),
+            mock.patch.object(main, "run_full_council", failing_council),
+            mock.patch.object(main, "stage2_collect_rankings", failing_council),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        storage._conversation_cache.clear()
+        self.addCleanup(storage._conversation_cache.clear)
+
+        self.conversation = storage.create_conversation("a")
+
+    def assert_title_saved(self):
+        storage._conversation_cache.clear()
+        self.assertEqual(storage.get_conversation("a")["title"], "Saved Title")
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        self.assertEqual(pending, [])
+
+    async def test_send_message_keeps_title(self):
+        with self.assertRaisesRegex(RuntimeError, "council failed"):
+            await main.send_message("a", main.SendMessageRequest(content="q"), self.conversation)
+
+        self.assert_title_saved()
+
+    async def test_stream_keeps_title(self):
+        async def no_stage1(user_query, stage1_results):
+            return
+            yield
+
+        with mock.patch.object(main, "stream_stage1", no_stage1):
+            response = await main.send_message_stream(
+                "a", main.SendMessageRequest(content="q"), self.conversation
+            )
+            frames = [frame async for frame in response.body_iterator]
+
+        self.assertIn(b'"error"', frames[-1])
+        self.assert_title_saved()
+
+
+if __name__ == "__main__":
+    unittest.main()
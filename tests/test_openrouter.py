@@ -0,0 +1,125 @@
+"""Tests for the OpenRouter client helpers."""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import httpx
+
+from backend import openrouter
+
+
+def sse_body(*events):
+    """Build an OpenRouter-style SSE body from raw lines and chunk dicts."""
+    lines = [event if isinstance(event, str) else "data: " + json.dumps(event) for event in events]
+    return ("\n\n".join(lines) + "\n\n").encode()
+
+
+def delta_chunk(**delta):
+    return {"choices": [{"index": 0, "delta": delta}]}
+
+
+class QueryModelsAsCompletedTest(unittest.IsolatedAsyncioTestCase):
+    async def test_closing_early_cancels_remaining_queries(self):
+        running = set()
+
+        async def slow_query(model, messages, timeout=120.0, on_delta=None, deadline=None):
+            running.add(model)
+            try:
+                await asyncio.sleep(0 if model == "fast" else 10)
+                return {"content": model}
+            finally:
+                running.discard(model)
+
+        models = ["fast", "slow-1", "slow-2", "slow-3"]
+        with mock.patch.object(openrouter, "query_model", slow_query):
+            results = openrouter.query_models_as_completed(models, [])
+            model, response = await results.__anext__()
+            self.assertEqual(model, "fast")
+            self.assertEqual(running, {"slow-1", "slow-2", "slow-3"})
+
+            await results.aclose()
+            # Let the cancelled tasks unwind
+            await asyncio.sleep(0)
+
+        self.assertEqual(running, set())
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        self.assertEqual(pending, [])
+
+
+class QueryModelDeadlineTest(unittest.IsolatedAsyncioTestCase):
+    async def slow_completion(self, headers, payload, timeout):
+        await asyncio.sleep(0.3)
+        return {"content": "late", "reasoning_details": None}
+
+    async def test_no_deadline_by_default(self):
+        with mock.patch.object(openrouter, "_post_completion", self.slow_completion):
+            response = await openrouter.query_model("model", [], timeout=0.1)
+        self.assertEqual(response["content"], "late")
+
+    async def test_deadline_drops_slow_model(self):
+        with mock.patch.object(openrouter, "_post_completion", self.slow_completion):
+            response = await openrouter.query_model("model", [], deadline=0.1)
+        self.assertIsNone(response)
+
+
+class StreamCompletionTest(unittest.IsolatedAsyncioTestCase):
+    def use_body(self, body):
+        """Serve every request from the shared client with `body` as an SSE stream."""
+        def handler(request):
+            self.request_payload = json.loads(request.content)
+            return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(client.aclose)
+        patcher = mock.patch.object(openrouter, "_client", client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_collects_deltas_and_reasoning(self):
+        self.use_body(sse_body(
+            ": OPENROUTER PROCESSING",
+            {"choices": []},
+            delta_chunk(role="assistant", content="Hel"),
+            delta_chunk(reasoning_details=[{"type": "reasoning.text", "text": "a"}]),
+            delta_chunk(content="lo", reasoning_details=[{"type": "reasoning.text", "text": "b"}]),
+            "data: [DONE]",
+            delta_chunk(content="ignored after DONE"),
+        ))
+        deltas = []
+
+        response = await openrouter.query_model("model", [], on_delta=deltas.append)
+
+        self.assertTrue(self.request_payload["stream"])
+        self.assertEqual(deltas, ["Hel", "lo"])
+        self.assertEqual(response, {
+            "content": "Hello",
+            "reasoning_details": [
+                {"type": "reasoning.text", "text": "a"},
+                {"type": "reasoning.text", "text": "b"},
+            ],
+        })
+
+    async def test_no_reasoning_gives_none(self):
+        self.use_body(sse_body(delta_chunk(content="Hi"), "data: [DONE]"))
+
+        response = await openrouter.query_model("model", [], on_delta=lambda delta: None)
+
+        self.assertEqual(response, {"content": "Hi", "reasoning_details": None})
+
+    async def test_error_chunk_fails_the_query(self):
+        self.use_body(sse_body(
+            delta_chunk(content="Hel"),
+            {"error": {"code": 502, "message": "provider went away"}},
+        ))
+
+        with self.assertRaisesRegex(RuntimeError, "provider went away"):
+            await openrouter._stream_completion({}, {"model": "model"}, 10.0, lambda delta: None)
+
+        response = await openrouter.query_model("model", [], on_delta=lambda delta: None)
+        self.assertIsNone(response)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for conversation storage."""
+
+import json
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import storage
+
+
+class WriteJsonAtomicTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "conversation.json")
+
+    def test_writes_with_umask_derived_mode(self):
+        umask = os.umask(0o022)
+        try:
+            storage._write_json_atomic(self.path, {"id": "x"})
+        finally:
+            os.umask(umask)
+
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '{"id":"x"}')
+        if os.name == "posix":
+            self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+
+    def test_failed_write_leaves_no_temp_file(self):
+        storage._write_json_atomic(self.path, {"id": "old"})
+
+        with mock.patch.object(storage.json, "dump", side_effect=RuntimeError("boom")):
+            with self.assertRaisesRegex(RuntimeError, "boom"):
+                storage._write_json_atomic(self.path, {"id": "new"})
+
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["conversation.json"])
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '{"id":"old"}')
+
+
+class ConversationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        for patcher in (
+            mock.patch.object(storage, "DATA_DIR", self.tmp_dir.name),
+            mock.patch.object(storage, "CONVERSATION_CACHE_SIZE", 2),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        storage._conversation_cache.clear()
+        self.addCleanup(storage._conversation_cache.clear)
+
+    def read_from_disk(self, conversation_id):
+        with open(storage.get_conversation_path(conversation_id)) as f:
+            return json.load(f)
+
+    def test_cache_hit_skips_disk(self):
+        storage.create_conversation("a")
+        os.remove(storage.get_conversation_path("a"))
+
+        self.assertEqual(storage.get_conversation("a")["id"], "a")
+
+    def test_evicts_least_recently_used(self):
+        storage.create_conversation("a")
+        storage.create_conversation("b")
+        storage.get_conversation("a")
+        storage.create_conversation("c")
+
+        self.assertEqual(list(storage._conversation_cache), ["a", "c"])
+        self.assertIsNone(storage.get_cached_conversation("b"))
+        # Evicted conversations are still read back from disk
+        self.assertEqual(storage.get_conversation("b")["id"], "b")
+
+    def test_callers_get_copies(self):
+        storage.create_conversation("a")
+
+        conversation = storage.get_conversation("a")
+        conversation["title"] = "changed"
+        conversation["messages"].append({"role": "user", "content": "unsaved"})
+
+        cached = storage.get_cached_conversation("a")
+        self.assertEqual(cached["title"], "New Conversation")
+        self.assertEqual(cached["messages"], [])
+
+    def test_failed_save_drops_cache_entry(self):
+        conversation = storage.create_conversation("a")
+
+        with mock.patch.object(storage, "_write_json_atomic", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                storage.add_user_message("a", "hello", conversation)
+
+        self.assertIsNone(storage.get_cached_conversation("a"))
+        self.assertEqual(conversation["messages"], [])
+        self.assertEqual(storage.get_conversation("a")["messages"], [])
+
+    def test_updates_from_stale_copies_keep_every_message(self):
+        storage.create_conversation("a")
+        first = storage.get_conversation("a")
+        second = storage.get_conversation("a")
+
+        storage.add_user_message("a", "one", first)
+        storage.add_user_message("a", "two", second)
+        storage.update_conversation_title("a", "Title", first)
+
+        for conversation in (storage.get_cached_conversation("a"), self.read_from_disk("a")):
+            self.assertEqual([m["content"] for m in conversation["messages"]], ["one", "two"])
+            self.assertEqual(conversation["title"], "Title")
+        self.assertEqual(first["title"], "Title")
+
+
+if __name__ == "__main__":
+    unittest.main()